@@ -4,7 +4,7 @@
 # 1) Prepare data/errors/screenshots directories.
 # 2) Safe JSON read with fallback; backup corrupted files.
 # 3) Atomic JSON write via temp file + os.replace.
-# 4) JSONL append and robust JSONL reader (skip broken lines).
+# 4) JSONL append (single or batched) and robust JSONL reader (skip broken lines); orjson when installed.
 # 5) Time helpers: now_iso(), ts().
 # 6) Launch Chromium (headful/headless) with optional storage_state.json.
 # 7) Save storage state to storage_state.json.
@@ -13,13 +13,22 @@
 # 10) Login detection heuristic via multiple selectors.
 # ---------------------------------------------------------------------------
 
-import json, os, time, traceback, random
+from __future__ import annotations
+
+import json, os, time, traceback, random, threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
 import os, shutil
-from typing import Iterator
-from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:  # imported lazily: JSONL/path helpers must not pull in Playwright
+    from playwright.sync_api import Browser, BrowserContext, Page
+
+try:
+    import orjson  # optional: C-implemented JSON, much faster on hot JSONL paths
+except ImportError:
+    orjson = None
 
 DATA_DIR = Path("data")
 ERRORS_DIR = DATA_DIR / "errors"
@@ -55,10 +64,66 @@ def dump_json(path: Path, data: Dict[str, Any]) -> None:
         json.dump(data, f, ensure_ascii=False, indent=2)
     os.replace(tmp, path)
 
+def dumps_line(item: Dict[str, Any]) -> str:
+    """Serialize one JSONL line (with trailing newline); non-ASCII kept as UTF-8."""
+    if orjson is not None:
+        return orjson.dumps(item).decode("utf-8") + "\n"
+    return json.dumps(item, ensure_ascii=False) + "\n"
+
+def loads_line(line: str | bytes) -> Any:
+    """Parse one JSONL line; raises json.JSONDecodeError (orjson's error subclasses it)."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
 def append_jsonl(path: Path, item: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        f.write(dumps_line(item))
+
+class JsonlBatcher:
+    """
+    Buffer JSONL rows and append them with one write per flush: every `max_rows` rows,
+    `max_bytes` of pending text, or `max_age_s` since the oldest pending row (checked on add).
+    Call flush() (or use as a context manager) before the file is read back.
+    """
+    def __init__(self, path: Path, max_rows: int = 50, max_bytes: int = 64 * 1024, max_age_s: float = 5.0):
+        self.path = path
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self._lines: List[str] = []
+        self._size = 0
+        self._since = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, item: Dict[str, Any]) -> None:
+        line = dumps_line(item)
+        with self._lock:
+            if not self._lines:
+                self._since = time.monotonic()
+            self._lines.append(line)
+            self._size += len(line)
+            due = (len(self._lines) >= self.max_rows or self._size >= self.max_bytes
+                   or time.monotonic() - self._since >= self.max_age_s)
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._lines:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write("".join(self._lines))
+            self._lines.clear()
+            self._size = 0
+
+    def __enter__(self) -> "JsonlBatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
 
 def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
     if not path.exists():
@@ -69,7 +134,7 @@ def read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
             if not line:
                 continue
             try:
-                yield json.loads(line)
+                yield loads_line(line)
             except json.JSONDecodeError:
                 continue
 
@@ -80,6 +145,7 @@ def ts() -> str:
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
 def launch_browser(headful: bool = True) -> tuple[Browser, BrowserContext]:
+    from playwright.sync_api import sync_playwright
     pw = sync_playwright().start()
     browser = pw.chromium.launch(
         headless=not headful,
@@ -116,16 +182,15 @@ def handle_error(page: Page | None, script_name: str, fail_fast: bool, step_info
     if fail_fast:
         raise
 
+# Any visible logged-in marker; one union selector resolved in the browser (single round-trip)
+_LOGGED_IN_SELECTOR = ", ".join(f"{sel}:visible" for sel in (
+    '[data-testid="user-menu"]',
+    'button:has-text("Log out")',
+    '*[aria-label="My profile"]',
+))
+
 def is_logged_in(page: Page) -> bool:
-    candidates = [
-        '[data-testid="user-menu"]',
-        'button:has-text("Log out")',
-        '*[aria-label="My profile"]'
-    ]
-    for sel in candidates:
-        try:
-            if page.locator(sel).first.is_visible():
-                return True
-        except Exception:
-            continue
-    return False
+    try:
+        return page.locator(_LOGGED_IN_SELECTOR).count() > 0
+    except Exception:
+        return False
@@ -24,7 +24,7 @@ from pathlib import Path
 from datetime import datetime
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from .common import (
-    read_jsonl, append_jsonl, load_json,
+    read_jsonl, JsonlBatcher, load_json,
     LINKS_JSONL, STATE_JSON, now_iso,
     ERRORS_DIR, SCREENSHOTS_DIR, STORAGE_STATE_JSON
 )
@@ -130,10 +130,13 @@ async def _press_down(page: Page):
         with contextlib.suppress(Exception): await page.keyboard.press("ArrowDown")
         await asyncio.sleep(0.05)
 
+# New links are appended in batches; flushed at the end of every collect_for run
+_LINKS_OUT = JsonlBatcher(LINKS_JSONL)
+
 def _save_new_if_needed(di: str, url: str, seen_global: Set[str], job: str, loc: str) -> bool:
     if not url or url in seen_global:
         return False
-    append_jsonl(LINKS_JSONL, {
+    _LINKS_OUT.add({
         "id": f"jj-{di}",
         "data_index": str(di),
         "job_name": job,
@@ -149,12 +152,12 @@ def _save_new_if_needed(di: str, url: str, seen_global: Set[str], job: str, loc:
 async def _scan_and_save(page: Page, seen_global: Set[str], job: str, loc: str, results_in_run: List[Tuple[str,str]]) -> int:
     added_count = 0
     try:
-        handles = await page.locator(XPATH_STRICT).element_handles()
+        # all hrefs in one round-trip instead of one get_attribute per anchor handle
+        hrefs = await page.locator(XPATH_STRICT).evaluate_all("els => els.map(e => e.getAttribute('href'))")
     except:
         return 0
-    for h in handles:
+    for href in hrefs:
         try:
-            href = await h.get_attribute("href")
             if not href:
                 continue
             abs_url = urllib.parse.urljoin(page.url, href)
@@ -247,6 +250,7 @@ async def collect_for(job: str, loc: str, cfg: dict) -> bool:
         await async_handle_error(page, "s2_collect", f"{job}|{loc}", cfg["FAIL_FAST"])
         return False
     finally:
+        _LINKS_OUT.flush()
         await safe_close(ctx, browser)
 
 async def main_async():
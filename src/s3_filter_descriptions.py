@@ -27,6 +27,9 @@
 #   (d) close the popup tab and proceed.
 # -----------------------------------------------------------------------------
 
+from __future__ import annotations
+
+import argparse
 import asyncio
 import json
 import os
@@ -35,18 +38,30 @@ import random
 import traceback
 import tempfile
 import shutil
+import sys
+import threading
+import time
+from collections import defaultdict
 from contextlib import suppress
-from urllib.parse import urljoin
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urljoin, urlparse
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Union, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Tuple, Union, Optional, Iterator
+
+if TYPE_CHECKING:  # Playwright itself is imported in run_with_config, when a browser is needed
+    from playwright.async_api import Page, BrowserContext
 
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+try:
+    import ahocorasick  # optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
 
 from .common import (
     DATA_DIR, ERRORS_DIR, SCREENSHOTS_DIR,
     LINKS_JSONL, FILTERED_JSONL, STORAGE_STATE_JSON,
-    read_jsonl, append_jsonl,  # kept import; we only write single-line JSONL here
+    read_jsonl, append_jsonl, dumps_line, loads_line,  # append_jsonl kept; we only write single-line JSONL here
     now_iso, human_sleep
 )
 
@@ -55,6 +70,9 @@ DEFAULT_KEYWORDS = ["python", "playwright", "javascript", "typescript"]
 # --- S4 fields collection ---
 FIELDS_JSONL = DATA_DIR / "fields.jsonl"
 
+# Chromium profile reused across runs (HTTP cache, service workers, cookies)
+PROFILE_DIR = DATA_DIR / ".pw-profile"
+
 
 # ------------------------------- Logging -------------------------------------
 
@@ -64,12 +82,18 @@ def _log(msg: str) -> None:
 def _log_s4(msg: str) -> None:
     print(f"[S4] {msg}", flush=True)
 
+_SAFE = re.compile(r"[^a-zA-Z0-9._-]+")
+
 def safe_filename(s: str) -> str:
-    return re.sub(r"[^a-zA-Z0-9._-]+", "_", s)
+    return _SAFE.sub("_", s)
 
 
 # ------------------------- One-line JSONL + UPSERT ---------------------------
 
+# Writers run in worker threads (asyncio.to_thread) from concurrent rows
+_FILTERED_LOCK = threading.Lock()
+_FIELDS_LOCK = threading.Lock()
+
 _SPECIAL_FIRST = "final_url"
 _SPECIAL_MID_LAST = ("url", "description_sample")
 
@@ -95,7 +119,14 @@ def _ordered_for_dump(d: Dict[str, Any]) -> Dict[str, Any]:
 
 def _dump_one_line(obj: Dict[str, Any]) -> str:
     """Dump object as a single-line JSON string with enforced key order."""
-    return json.dumps(_ordered_for_dump(obj), ensure_ascii=False)
+    return dumps_line(_ordered_for_dump(obj)).rstrip("\n")
+
+def _file_fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
 
 def _iter_jsonl_one_line(p: Path):
     """
@@ -110,186 +141,331 @@ def _iter_jsonl_one_line(p: Path):
             if not s:
                 continue
             try:
-                obj = json.loads(s)
+                obj = loads_line(s)
                 if isinstance(obj, dict):
                     yield obj
             except Exception:
                 continue
 
-def _upsert_filtered_record_oneline(record: Dict[str, Any], match_by_final_url: bool = False) -> None:
+# ids present in FILTERED_JSONL, keyed by the file's (mtime_ns, size) after our last read/write
+_FILTERED_IDS_CACHE: Optional[Tuple[Tuple[int, int], set]] = None
+
+def _upsert_filtered_records_locked(items: List[Tuple[Dict[str, Any], bool]]) -> None:
     """
-    Upsert into FILTERED_JSONL (one-line objects):
-      - If existing line with same 'id' (and optionally same 'final_url') is found:
-          shallow-merge 'record' into it, then replace that line with ordered single-line JSON.
-      - Else: append a new single-line JSON object at the end.
-    Atomic replace is used on update for safety.
+    Upsert records into FILTERED_JSONL (one-line objects), in order, with one read and one rewrite:
+      - a line with the same 'id' (and, if the flag is set, the same 'final_url') gets the record
+        shallow-merged into it;
+      - otherwise the record is appended. The file is replaced atomically on update.
+    When the cached id set shows every record is new, they are appended without a rewrite.
+    Caller holds _FILTERED_LOCK.
     """
+    global _FILTERED_IDS_CACHE
+    if not items:
+        return
     path = Path(FILTERED_JSONL)
-    rec_id = str(record.get("id") or "")
-    rec_final_url = str(record.get("final_url") or "")
-
     path.parent.mkdir(parents=True, exist_ok=True)
-    if not path.exists():
-        with path.open("w", encoding="utf-8", newline="\n") as fh:
-            fh.write(_dump_one_line(record) + "\n")
-        return
 
-    found = False
-    with path.open("r", encoding="utf-8", newline="\n") as src, \
-         tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="\n", delete=False) as tmp:
+    fp = _file_fingerprint(path)
+    known = _FILTERED_IDS_CACHE[1] if _FILTERED_IDS_CACHE and _FILTERED_IDS_CACHE[0] == fp else None
+    if known is not None:
+        batch_ids = [str(r.get("id") or "") for r, _ in items]
+        if len(set(batch_ids)) == len(batch_ids) and known.isdisjoint(batch_ids):
+            with path.open("a", encoding="utf-8", newline="\n") as f:
+                f.writelines(_dump_one_line(r) + "\n" for r, _ in items)
+            known.update(batch_ids)
+            new_fp = _file_fingerprint(path)
+            _FILTERED_IDS_CACHE = (new_fp, known) if new_fp else None
+            return
+
+    # Raw lines are written back verbatim unless merged into; parsed dicts are indexed by id.
+    lines: List[str] = []
+    objs: Dict[int, Dict[str, Any]] = {}
+    by_id: Dict[str, List[int]] = {}
+    if path.exists():
+        with path.open("r", encoding="utf-8", newline="\n") as src:
+            for line in src:
+                s = line.strip()
+                obj = None
+                if s:
+                    with suppress(Exception):
+                        obj = loads_line(s)
+                if not line.endswith("\n"):
+                    line += "\n"  # a hand-edited last line must not swallow appended rows
+                if isinstance(obj, dict):
+                    objs[len(lines)] = obj
+                    by_id.setdefault(str(obj.get("id") or ""), []).append(len(lines))
+                lines.append(line)
+
+    for record, match_by_final_url in items:
+        rec_id = str(record.get("id") or "")
+        rec_final_url = str(record.get("final_url") or "")
+        hit = None
+        for i in by_id.get(rec_id, ()):
+            if not match_by_final_url or str(objs[i].get("final_url") or "") == rec_final_url:
+                hit = i
+                break
+        if hit is None:
+            hit = len(lines)
+            by_id.setdefault(rec_id, []).append(hit)
+            objs[hit] = dict(record)
+            lines.append("")
+        else:
+            objs[hit].update(record)  # shallow merge
+        lines[hit] = _dump_one_line(objs[hit]) + "\n"
+
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="\n", delete=False,
+                                     dir=str(path.parent)) as tmp:
         tmp_path = Path(tmp.name)
-        for line in src:
-            raw = line.rstrip("\n")
-            s = raw.strip()
-            if not s:
-                tmp.write(line)
-                continue
-            try:
-                obj = json.loads(s)
-            except Exception:
-                tmp.write(line)
-                continue
+        tmp.writelines(lines)
+    shutil.move(str(tmp_path), str(path))
+    new_fp = _file_fingerprint(path)
+    _FILTERED_IDS_CACHE = (new_fp, set(by_id)) if new_fp else None
 
-            if isinstance(obj, dict) and not found:
-                oid = str(obj.get("id") or "")
-                o_final = str(obj.get("final_url") or "")
-                is_match = (oid == rec_id) and (o_final == rec_final_url if match_by_final_url else True)
-                if is_match:
-                    obj.update(record)  # shallow merge
-                    tmp.write(_dump_one_line(obj) + "\n")
-                    found = True
-                    continue
+# process_one results are buffered and upserted in one rewrite per flush
+_FILTERED_BUFFER: List[Tuple[Dict[str, Any], bool]] = []
+FILTERED_FLUSH_EVERY = 16
 
-            tmp.write(line)
+def _flush_filtered() -> None:
+    with _FILTERED_LOCK:
+        items = _FILTERED_BUFFER[:]
+        _FILTERED_BUFFER.clear()
+        _upsert_filtered_records_locked(items)
 
-        if not found:
-            tmp.write(_dump_one_line(record) + "\n")
-
-    shutil.move(str(tmp_path), str(path))
+async def _store_filtered(record: Dict[str, Any], match_by_final_url: bool = False) -> None:
+    _FILTERED_BUFFER.append((record, match_by_final_url))
+    if len(_FILTERED_BUFFER) >= FILTERED_FLUSH_EVERY:
+        await asyncio.to_thread(_flush_filtered)
 
 
 # ----------------------------- Keyword helpers -------------------------------
 
+_KW_SPLIT = re.compile(r"[,\s/]+")
+
 def _normalize_keyword_token(tok: str) -> List[str]:
-    parts = re.split(r"[,\s/]+", tok)
-    return [p.strip().lower() for p in parts if p.strip()]
+    parts = _KW_SPLIT.split(tok)
+    # interned once here; every JD is matched against these same short strings
+    return [sys.intern(p.strip().lower()) for p in parts if p.strip()]
+
+@lru_cache(maxsize=8)
+def _normalize_keywords_cached(src_tup: Optional[Tuple[str, ...]]) -> Tuple[str, ...]:
+    if src_tup is None:
+        return tuple(DEFAULT_KEYWORDS)
+    seen, out = set(), []
+    for t in src_tup:
+        for kw in _normalize_keyword_token(t):
+            if kw not in seen:
+                seen.add(kw)
+                out.append(kw)
+    return tuple(out) or tuple(DEFAULT_KEYWORDS)
 
 def normalize_keywords(src: Union[str, List[str], None]) -> List[str]:
-    toks: List[str] = []
     if isinstance(src, list):
-        for t in src:
-            toks.extend(_normalize_keyword_token(str(t)))
+        key: Optional[Tuple[str, ...]] = tuple(str(t) for t in src)
     elif isinstance(src, str):
-        toks.extend(_normalize_keyword_token(src))
+        key = (src,)
     else:
-        toks.extend(DEFAULT_KEYWORDS)
-    seen, out = set(), []
-    for t in toks:
-        if t and t not in seen:
-            seen.add(t)
-            out.append(t)
-    return out or DEFAULT_KEYWORDS[:]
-
-def find_keywords(text: str, keywords: List[str]) -> Tuple[bool, List[str]]:
-    text_l = text.lower()
-    matched = [kw for kw in keywords if kw in text_l]
+        key = None
+    return list(_normalize_keywords_cached(key))
+
+KeywordMatcher = Union["ahocorasick.Automaton", List[str]]
+
+def build_keyword_matcher(keywords: List[str]) -> KeywordMatcher:
+    """
+    Build an Aho-Corasick automaton once per run so each JD is scanned in a single pass.
+    Falls back to the plain keyword list when pyahocorasick is not installed.
+    """
+    if ahocorasick is None:
+        return keywords
+    automaton = ahocorasick.Automaton()
+    for idx, kw in enumerate(keywords):
+        automaton.add_word(kw, (idx, kw))
+    automaton.make_automaton()
+    return automaton
+
+def find_keywords(text_l: str, matcher: KeywordMatcher) -> Tuple[bool, List[str]]:
+    """Match keywords against already-lowercased text (lowercase once per row in the caller)."""
+    if not text_l:
+        return (False, [])
+    if isinstance(matcher, list):
+        matched = [kw for kw in matcher if kw in text_l]
+    else:
+        # keep config order of keywords, as the substring loop did
+        matched = [kw for _, kw in sorted({v for _, v in matcher.iter(text_l)})]
     return (len(matched) > 0, matched)
 
 
 # ------------------------------- Page helpers --------------------------------
 
-async def slow_scroll_page_to_bottom(page: Page, step_px: int = 400, max_steps: int = 120, pause_s: float = 3.6):
-    for _ in range(max_steps):
-        try:
-            done = await page.evaluate(
-                """(step) => {
-                    const el = document.scrollingElement || document.documentElement;
-                    el.scrollBy(0, step || 400);
-                    return Math.ceil(el.scrollTop + window.innerHeight) >= el.scrollHeight - 2;
-                }""",
-                step_px
-            )
-        except Exception:
-            done = True
-        if done:
-            break
-        await asyncio.sleep(pause_s)
+# Hosts whose job pages render lazily (SPA) and need a DOM-quiet wait + scrolling.
+_LAZY_HOSTS = ("justjoin.it", "myworkdayjobs.com", "smartrecruiters.com")
+
+@lru_cache(maxsize=1024)
+def _host(url: str) -> str:
+    return (urlparse(url or "").netloc or "").lower()
+
+def _host_matches(host: str, domains) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+def _needs_lazy_load(url: str) -> bool:
+    return _host_matches(_host(url), _LAZY_HOSTS)
+
+# Whole scroll loop runs in the page (one round-trip): short pause per mid-page step; at the
+# bottom, poll up to `pause` ms for lazy content to grow the page and stop when it does not.
+_SCROLL_TO_BOTTOM_JS = """
+async ({step, max, pause}) => {
+  const el = document.scrollingElement || document.documentElement;
+  const sleep = (ms) => new Promise(r => setTimeout(r, ms));
+  for (let i = 0; i < max; i++) {
+    el.scrollBy(0, step || 400);
+    if (Math.ceil(el.scrollTop + window.innerHeight) < el.scrollHeight - 2) {
+      await sleep(100);
+      continue;
+    }
+    const h = el.scrollHeight;
+    let grew = false;
+    for (let waited = 0; waited < pause && !grew; waited += 50) {
+      await sleep(50);
+      grew = el.scrollHeight > h;
+    }
+    if (!grew) return i + 1;
+  }
+  return max;
+}
+"""
+
+async def slow_scroll_page_to_bottom(page: Page, step_px: int = 400, max_steps: int = 120, pause_s: float = 0.4):
+    """
+    Scroll down step by step. Mid-page steps only pause briefly; at the bottom wait up to
+    pause_s for lazy content to grow the page and stop as soon as it does not.
+    """
+    with suppress(Exception):
+        await page.evaluate(_SCROLL_TO_BOTTOM_JS,
+                            {"step": step_px, "max": max_steps, "pause": int(pause_s * 1000)})
+
+# Installed in every document (add_init_script): timestamps the last DOM mutation so readiness
+# can be awaited as "DOM quiet" instead of networkidle, which trackers and long-polls keep busy.
+DOM_QUIET_INIT_JS = """
+(() => {
+  window.__s3LastMutation = performance.now();
+  new MutationObserver(() => { window.__s3LastMutation = performance.now(); })
+    .observe(document, {childList: true, subtree: true, characterData: true});
+})();
+"""
+
+async def wait_dom_quiet(page: Page, quiet_ms: int = 300, timeout_ms: int = 3000) -> None:
+    """Wait until the DOM has not changed for quiet_ms (bounded by timeout_ms)."""
+    with suppress(Exception):
+        await page.wait_for_function(
+            """(q) => document.readyState !== 'loading'
+                      && performance.now() - (window.__s3LastMutation || 0) > q""",
+            arg=quiet_ms, timeout=timeout_ms,
+        )
 
-async def get_job_description_text(page: Page) -> str:
-    try:
-        blocks = page.locator("xpath=//h2/../../")
-        cnt = await blocks.count()
-        if cnt > 0:
-            texts = []
-            for i in range(min(cnt, 8)):
-                blk = blocks.nth(i)
-                with suppress(Exception):
-                    await blk.scroll_into_view_if_needed()
-                # encourage rendering
-                for _ in range(40):
-                    try:
-                        handle = await blk.element_handle()
-                        at_bottom = await page.evaluate(
-                            """(el) => {
-                                const r = el.getBoundingClientRect();
-                                const vpH = window.innerHeight || document.documentElement.clientHeight;
-                                return (r.bottom <= vpH + 2);
-                            }""",
-                            handle
-                        )
-                    except Exception:
-                        at_bottom = True
-                    if at_bottom:
-                        break
-                    with suppress(Exception):
-                        await page.mouse.wheel(0, 320)
-                    await asyncio.sleep(3.6)
-                await asyncio.sleep(7.5)
-                with suppress(Exception):
-                    t = (await blk.inner_text(timeout=2000)).strip()
-                    if len(t) > 50:
-                        texts.append(t)
-            if texts:
-                texts.sort(key=len, reverse=True)
-                return texts[0]
-    except Exception:
-        pass
-
-    # Fallback candidates
-    candidates = [
-        '[data-testid="job-description"]',
-        '[data-test="job-description"]',
-        '[data-testid="offer-description"]',
-        '[data-testid="sections"]',
-        'section:has(h2:has-text("Job Description"))',
-        'section:has(h2:has-text("Opis"))',
-        'section:has(h2:has-text("Description"))',
-        "article",
-        "main",
-    ]
-    for sel in candidates:
-        try:
-            loc = page.locator(sel)
-            n = await loc.count()
-            if n > 0:
-                texts = []
-                for i in range(min(n, 6)):
-                    with suppress(Exception):
-                        t = await loc.nth(i).inner_text(timeout=2000)
-                        if t and len(t.strip()) > 50:
-                            texts.append(t.strip())
-                if texts:
-                    texts.sort(key=len, reverse=True)
-                    return texts[0]
-        except Exception:
-            continue
+# Description containers, tried in order: plain CSS, or a <section> whose <h2> contains the text.
+_JD_CANDIDATES: List[Dict[str, str]] = [
+    {"css": '[data-testid="job-description"]'},
+    {"css": '[data-test="job-description"]'},
+    {"css": '[data-testid="offer-description"]'},
+    {"css": '[data-testid="sections"]'},
+    {"h2": "job description"},
+    {"h2": "opis"},
+    {"h2": "description"},
+    {"css": "article"},
+    {"css": "main"},
+]
+
+# One in-page pass over all candidates; returns the longest text (>50 chars) of the first hit.
+_JD_CANDIDATES_JS = """
+(cands) => {
+  // <section> heading texts are collected once, on the first h2 candidate, and shared
+  let sections = null;
+  const headed = (needle) => {
+    if (sections === null) {
+      sections = Array.from(document.querySelectorAll('section')).map(s => [s,
+        Array.from(s.querySelectorAll('h2'), h => (h.textContent || '').toLowerCase())]);
+    }
+    return sections.filter(([, hs]) => hs.some(t => t.includes(needle))).map(([s]) => s);
+  };
+  const pick = (c) => c.css ? Array.from(document.querySelectorAll(c.css)) : headed(c.h2);
+  for (const c of cands) {
+    let best = '';
+    for (const el of pick(c).slice(0, 6)) {
+      const t = (el.innerText || '').trim();
+      if (t.length > best.length) best = t;
+    }
+    if (best.length > 50) return best;
+  }
+  return '';
+}
+"""
+
+# Blocks two levels above each <h2> (same as xpath //h2/../..), read in one pass.
+_H2_BLOCKS_JS = """
+() => {
+  const seen = new Set();
+  const out = [];
+  for (const h of document.querySelectorAll('h2')) {
+    let n = h;
+    for (let i = 0; i < 2 && n.parentElement; i++) n = n.parentElement;
+    if (seen.has(n)) continue;
+    seen.add(n);
+    const t = (n.innerText || '').trim();
+    if (t.length > 50) out.push(t);
+    if (seen.size >= 8) break;
+  }
+  return out;
+}
+"""
+
+# Last resort: first non-empty main/body text. Checked in-page, so absent selectors cost nothing
+# (a locator.inner_text on a missing selector waits out its whole timeout).
+_MAIN_FALLBACK_SELECTORS = ["div[role='main']", "#__next main", "body"]
+_MAIN_FALLBACK_JS = """
+(sels) => {
+  for (const sel of sels) {
+    const el = document.querySelector(sel);
+    const t = el ? (el.innerText || '').trim() : '';
+    if (t) return t;
+  }
+  return '';
+}
+"""
+
+async def get_job_description_texts(page: Page) -> List[str]:
+    """
+    Return description candidates of the first stage that has any, in priority order:
+      1) first matching candidate container (one in-page pass)
+      2) blocks two levels above each <h2> (all read in one evaluate)
+      3) main/body fallback
+    """
+    with suppress(Exception):
+        t = await page.evaluate(_JD_CANDIDATES_JS, _JD_CANDIDATES)
+        if t:
+            return [t]
 
-    for sel in ["div[role='main']", "#__next main", "body"]:
-        with suppress(Exception):
-            t = await page.locator(sel).inner_text(timeout=2000)
-            if t and t.strip():
-                return t.strip()
-    return ""
+    blocks: List[str] = []
+    with suppress(Exception):
+        blocks = await page.evaluate(_H2_BLOCKS_JS)
+    if blocks:
+        return blocks
+
+    with suppress(Exception):
+        t = await page.evaluate(_MAIN_FALLBACK_JS, _MAIN_FALLBACK_SELECTORS)
+        if t:
+            return [t]
+    return []
+
+async def read_description(page: Page, matcher: KeywordMatcher) -> Tuple[str, List[str]]:
+    """
+    Read all description candidates of the first stage that has any (one round-trip per stage).
+    Returns (longest candidate, used as the description sample; keywords matched across
+    every candidate, so ones that appear only in a later block are not lost).
+    """
+    texts = await get_job_description_texts(page)
+    if not texts:
+        return "", []
+    _, matched = find_keywords("\n".join(texts).lower(), matcher)  # lowercase once, one scan
+    return max(texts, key=len), matched
 
 
 # ---------------------- One-click Apply + completion helpers ------------------
@@ -307,150 +483,160 @@ _APP_DONE_RX = re.compile(
     re.I
 )
 
+# Role-first, then text-filtered fallbacks, all in one in-page scan (marks the hit with data-s3-oneclick).
+_FIND_ONE_CLICK_JS = """
+(rx) => {
+  for (const el of document.querySelectorAll('[data-s3-oneclick]')) el.removeAttribute('data-s3-oneclick');
+  const re = new RegExp(rx, 'i');
+  const mark = (el) => { el.setAttribute('data-s3-oneclick', '1'); return true; };
+  const label = (el) => (el.getAttribute('aria-label') || el.innerText || el.value || '').trim();
+  const text = (el) => el.innerText || el.textContent || '';
+  // role pass sees rendered controls only, like get_by_role did
+  const visible = (el) => el.getClientRects().length > 0;
+  for (const sel of ["button, [role='button'], input[type='submit'], input[type='button']",
+                     "a[href], [role='link']"]) {
+    const hit = Array.from(document.querySelectorAll(sel)).find(el => visible(el) && re.test(label(el)));
+    if (hit) return mark(hit);
+  }
+  for (const sel of ['button', 'a', '[data-testid]', '[data-test]', '[aria-label]']) {
+    const hit = Array.from(document.querySelectorAll(sel)).find(el => re.test(text(el)));
+    if (hit) return mark(hit);
+  }
+  return false;
+}
+"""
+
 async def find_one_click_apply(page: Page):
-    """Find a '1-click Apply' CTA by role-first + fallback text filters."""
-    for role in ("button", "link"):
-        loc = page.get_by_role(role, name=_ONECLICK_RX)
-        if await loc.count() > 0:
-            return loc.first
-    for sel in ("button", "a", "[data-testid]", "[data-test]", "[aria-label]"):
-        loc = page.locator(sel).filter(has_text=_ONECLICK_RX)
-        if await loc.count() > 0:
-            return loc.first
-    return None
+    """Find a '1-click Apply' CTA by role-first + fallback text filters, in one round-trip."""
+    try:
+        found = await page.evaluate(_FIND_ONE_CLICK_JS, _ONECLICK_RX.pattern)
+    except Exception:
+        return None
+    return page.locator("[data-s3-oneclick]").first if found else None
+
+# Completion check run in the page: rendered body text first, then dialog/toast roots
+# (their textContent also catches phrases split across lines).
+_APP_DONE_JS = """
+(rx) => {
+  const re = new RegExp(rx, 'i');
+  if (!document.body) return false;
+  if (re.test(document.body.innerText || '')) return true;
+  const sel = "[role='dialog'], [aria-modal='true'], .modal, .dialog, "
+            + "[class*='toast' i], [class*='notification' i]";
+  for (const el of document.querySelectorAll(sel)) {
+    if (re.test(el.innerText || '') || re.test(el.textContent || '')) return true;
+  }
+  return false;
+}
+"""
 
 async def wait_application_completed(page: Page, timeout_ms: int = 20000) -> bool:
     """Wait for a visible signal that application has been completed/submitted."""
     try:
+        # re-checked every 250 ms rather than on every animation frame
+        # (Playwright only accepts a number or "raf" for polling)
         await page.wait_for_function(
-            """(rx) => {
-                const re = new RegExp(rx, 'i');
-                const scan = (node) => {
-                  if (!node) return false;
-                  const txt = (node.innerText || node.textContent || '').trim();
-                  if (txt && re.test(txt)) return true;
-                  for (const el of (node.querySelectorAll?.('*') || [])) {
-                    const t = (el.innerText || el.textContent || '').trim();
-                    if (t && re.test(t)) return true;
-                  }
-                  return false;
-                };
-                return scan(document.body);
-            }""",
-            arg=_APP_DONE_RX.pattern,
-            timeout=timeout_ms
+            _APP_DONE_JS, arg=_APP_DONE_RX.pattern, polling=250, timeout=timeout_ms
         )
         return True
     except Exception:
+        # Last look, in case the signal landed right at the timeout
         try:
-            dlg = page.locator(
-                "[role='dialog'], [aria-modal='true'], .modal, .dialog, "
-                "[class*='toast' i], [class*='notification' i]"
-            )
-            if await dlg.count() > 0:
-                match = await dlg.filter(has_text=_APP_DONE_RX).count()
-                return match > 0
+            return bool(await page.evaluate(_APP_DONE_JS, _APP_DONE_RX.pattern))
         except Exception:
-            pass
-        return False
+            return False
 
 
 # --------------------------- S4: Overlay dismissal ---------------------------
 
+_DISMISS_NAME_RX = re.compile(
+    r"(accept|agree|allow|consent|got it|continue|ok|close|dismiss|"
+    r"akceptuj|zgadzam|zgoda|kontynuuj|zamknij|zamknąć|ok)", re.I
+)
+
+_DISMISS_SELECTORS = [
+    "#onetrust-accept-btn-handler",
+    "#onetrust-reject-all-handler",
+    ".onetrust-close-btn-handler",
+    "[id*='onetrust' i] button",
+    "[class*='cookie' i] button",
+    "[class*='cookies' i] button",
+    "[id*='cookie' i] button",
+    "button[aria-label*='accept' i]",
+    "button[aria-label*='agree' i]",
+    "button[aria-label*='close' i]",
+]
+
+# One pass in the page: click visible consent/close controls (CSS list first, then
+# buttons/links whose text or aria-label matches the dismiss regex), then hide big
+# fixed overlays. Returns how many elements were clicked or hidden.
+_DISMISS_JS = """
+({sels, rx, maxClicks}) => {
+  const re = new RegExp(rx, 'i');
+  const visible = (el) => !!(el.offsetParent || el.getClientRects().length);
+  const seen = new Set();
+  let acted = 0, clicked = 0;
+  const click = (el) => {
+    if (clicked >= maxClicks || seen.has(el) || !visible(el)) return;
+    seen.add(el);
+    try { el.click(); clicked++; } catch (e) {}
+  };
+  for (const s of sels) {
+    let els;
+    try { els = document.querySelectorAll(s); } catch (e) { continue; }
+    for (const el of els) click(el);
+  }
+  for (const el of document.querySelectorAll("button, [role='button'], a, [role='link']")) {
+    if (clicked >= maxClicks) break;
+    const name = (el.getAttribute('aria-label') || el.innerText || el.textContent || '').trim();
+    if (name && re.test(name)) click(el);
+  }
+  acted += clicked;
+
+  const W = window.innerWidth || document.documentElement.clientWidth || 0;
+  const H = window.innerHeight || document.documentElement.clientHeight || 0;
+  for (const el of document.querySelectorAll('*')) {
+    const st = getComputedStyle(el);
+    if (st.position !== 'fixed') continue;
+    const zi = parseInt(st.zIndex || '0', 10);
+    if (!Number.isFinite(zi) || zi < 1000) continue;
+    const r = el.getBoundingClientRect();
+    const area = Math.max(0, r.width) * Math.max(0, r.height);
+    if (area >= 0.2 * (W * H)) { // >=20% of viewport
+      el.style.setProperty('display', 'none', 'important');
+      el.style.setProperty('visibility', 'hidden', 'important');
+      el.style.setProperty('pointer-events', 'none', 'important');
+      acted++;
+    }
+  }
+  return acted;
+}
+"""
+
 async def dismiss_popups_and_cookies(page: Page, passes: int = 3) -> None:
     """
     Best-effort removal of cookie banners, modals, and blocking overlays in the popup tab.
-    Fast & bounded: a few short passes with small timeouts.
+    Fast & bounded: each pass is one in-page scan plus an Escape press, stopping at the
+    first pass that finds nothing to click or hide.
     """
-    import re as _re_local
-    _NAME_RX = _re_local.compile(
-        r"(accept|agree|allow|consent|got it|continue|ok|close|dismiss|"
-        r"akceptuj|zgadzam|zgoda|kontynuuj|zamknij|zamknąć|ok)", re.I
-    )
-
-    async def _role_clicks():
-        for role in ("button", "link"):
-            try:
-                loc = page.get_by_role(role, name=_NAME_RX)
-                cnt = await loc.count()
-                if cnt:
-                    for i in range(min(cnt, 4)):
-                        with suppress(Exception):
-                            await loc.nth(i).click(timeout=800)
-            except Exception:
-                pass
-
-    SELECTORS = [
-        "#onetrust-accept-btn-handler",
-        "#onetrust-reject-all-handler",
-        ".onetrust-close-btn-handler",
-        "[id*='onetrust' i] button",
-        "[class*='cookie' i] button",
-        "[class*='cookies' i] button",
-        "[id*='cookie' i] button",
-        "button[aria-label*='accept' i]",
-        "button[aria-label*='agree' i]",
-        "button[aria-label*='close' i]",
-        "button:has-text('Accept')",
-        "button:has-text('I agree')",
-        "button:has-text('OK')",
-        "button:has-text('Close')",
-        "button:has-text('Continue')",
-        "button:has-text('Akceptuj')",
-        "button:has-text('Zgadzam')",
-        "[role='dialog'] button:has-text('Close')",
-    ]
-
-    async def _selector_clicks():
-        for sel in SELECTORS:
-            try:
-                loc = page.locator(sel)
-                cnt = await loc.count()
-                for i in range(min(cnt, 4)):
-                    with suppress(Exception):
-                        await loc.nth(i).click(timeout=800)
-            except Exception:
-                pass
-
-    async def _press_escape():
-        with suppress(Exception):
-            await page.keyboard.press("Escape")
-
-    async def _hide_big_fixed_overlays():
+    args = {"sels": _DISMISS_SELECTORS, "rx": _DISMISS_NAME_RX.pattern, "maxClicks": 8}
+    for _ in range(max(1, passes)):
         try:
-            await page.evaluate("""
-                () => {
-                  const W = window.innerWidth || document.documentElement.clientWidth || 0;
-                  const H = window.innerHeight || document.documentElement.clientHeight || 0;
-                  const els = Array.from(document.querySelectorAll('*'));
-                  for (const el of els) {
-                    const st = getComputedStyle(el);
-                    if (st.position !== 'fixed') continue;
-                    const zi = parseInt(st.zIndex || '0', 10);
-                    if (!Number.isFinite(zi) || zi < 1000) continue;
-                    const r = el.getBoundingClientRect();
-                    const area = Math.max(0, r.width) * Math.max(0, r.height);
-                    if (area >= 0.2 * (W * H)) { // >=20% of viewport
-                      el.style.setProperty('display', 'none', 'important');
-                      el.style.setProperty('visibility', 'hidden', 'important');
-                      el.style.setProperty('pointer-events', 'none', 'important');
-                    }
-                  }
-                }
-            """)
+            acted = await page.evaluate(_DISMISS_JS, args) or 0
         except Exception:
-            pass
-
-    for _ in range(max(1, passes)):
-        await _role_clicks()
-        await _selector_clicks()
-        await _press_escape()
-        await _hide_big_fixed_overlays()
+            acted = 0
+        with suppress(Exception):
+            await page.keyboard.press("Escape")
+        if not acted:
+            break  # nothing left to dismiss; another pass would only repeat the same scan
         await asyncio.sleep(0.2)
 
 
 # --------------------------- S4: Field scraping utils ------------------------
 
+_WS_RX = re.compile(r"\s+")
+_REQUIRED_MARK_RX = re.compile(r"[:*]\s*$")
+
 def _normalize_output_field_name(name: str) -> str:
     """
     Normalize for storage & dedup:
@@ -461,31 +647,40 @@ def _normalize_output_field_name(name: str) -> str:
     """
     if not name:
         return ""
-    n = re.sub(r"\s+", " ", name).strip()
-    n = re.sub(r"[:*]\s*$", "", n).strip()
+    n = _WS_RX.sub(" ", name).strip()
+    n = _REQUIRED_MARK_RX.sub("", n).strip()
     return n.lower()
 
+# fields.jsonl names keyed by the file's (mtime_ns, size); re-parsed only when it changes
+_FIELD_NAMES_CACHE: Optional[Tuple[Tuple[int, int], set]] = None
+
 def _load_existing_field_names_lower() -> set:
     """
     Build a set of existing lowercase field names from fields.jsonl.
     Each line is expected to be a one-key object like {"name": ""}.
+    The parsed set is reused until the file's mtime/size changes.
     """
+    global _FIELD_NAMES_CACHE
+    fp = _file_fingerprint(FIELDS_JSONL)
+    if fp is None:
+        return set()
+    if _FIELD_NAMES_CACHE is not None and _FIELD_NAMES_CACHE[0] == fp:
+        return _FIELD_NAMES_CACHE[1]
     existing = set()
-    if not FIELDS_JSONL.exists():
-        return existing
     with FIELDS_JSONL.open("r", encoding="utf-8", newline="\n") as f:
         for line in f:
             s = line.strip()
             if not s:
                 continue
             try:
-                obj = json.loads(s)
+                obj = loads_line(s)
                 if isinstance(obj, dict) and len(obj) == 1:
                     key = next(iter(obj.keys()))
                     if isinstance(key, str):
                         existing.add(key.lower())
             except Exception:
                 continue
+    _FIELD_NAMES_CACHE = (fp, existing)
     return existing
 
 async def _collect_field_names_js(page: Page) -> List[str]:
@@ -516,12 +711,17 @@ async def _collect_field_names_js(page: Page) -> List[str]:
                 return r.width > 0 && r.height > 0;
               };
 
+              // label[for] resolved through one query + map, not a document lookup per field
+              const labelsByFor = new Map();
+              for (const lbl of document.querySelectorAll('label[for]')) {
+                const f = lbl.getAttribute('for');
+                if (f && !labelsByFor.has(f)) labelsByFor.set(f, lbl);
+              }
+
               const getLabelByFor = (el) => {
                 const id = el.getAttribute('id');
-                if (id) {
-                  const lbl = document.querySelector(`label[for="${CSS.escape(id)}"]`);
-                  if (lbl) return (lbl.innerText || lbl.textContent || '').trim();
-                }
+                const lbl = id ? labelsByFor.get(id) : null;
+                if (lbl) return (lbl.innerText || lbl.textContent || '').trim();
                 return null;
               };
 
@@ -569,19 +769,18 @@ async def _collect_field_names_js(page: Page) -> List[str]:
                 return [role, type, tag].filter(Boolean).join(' ').trim() || tag;
               };
 
+              const WS_RE = /\\s+/g;
               const fields = [];
-              const candidates = Array.from(document.querySelectorAll('input, textarea, select'));
+              // hidden inputs are excluded by the selector engine, so they never pay for style/layout reads
+              const candidates = document.querySelectorAll("input:not([type='hidden' i]), textarea, select");
 
               for (const el of candidates) {
                 if (!isVisible(el)) continue;
-                const tag = el.tagName.toLowerCase();
-                const tp  = (el.getAttribute('type') || '').toLowerCase();
-                if (tag === 'input' && tp === 'hidden') continue;
 
                 const name = getFieldName(el);
                 if (!name) continue;
 
-                const clean = name.replace(/\\s+/g, ' ').trim();
+                const clean = name.replace(WS_RE, ' ').trim();
                 if (!clean || clean.length > 200) continue;
 
                 fields.push(clean);
@@ -608,6 +807,7 @@ def _append_fields_jsonl_dedup_lower(names_raw: List[str]) -> None:
     Append new field names to fields.jsonl, one per line, as {"<lowercased>": ""}.
     Deduplicate against existing file contents and within this batch (case-insensitive).
     """
+    global _FIELD_NAMES_CACHE
     if not names_raw:
         return
 
@@ -626,29 +826,52 @@ def _append_fields_jsonl_dedup_lower(names_raw: List[str]) -> None:
     if not normalized_batch:
         return
 
-    # Load existing lowercase names from file for dedup
-    existing = _load_existing_field_names_lower()
-
-    to_write = [n for n in normalized_batch if n not in existing]
-    if not to_write:
-        return
-
-    FIELDS_JSONL.parent.mkdir(parents=True, exist_ok=True)
-    with FIELDS_JSONL.open("a", encoding="utf-8", newline="\n") as f:
-        for n in to_write:
-            f.write(json.dumps({n: ""}, ensure_ascii=False) + "\n")
-            _log_s4(f"New field added {n}")
+    with _FIELDS_LOCK:
+        # Load existing lowercase names from file for dedup
+        existing = _load_existing_field_names_lower()
+
+        to_write = [n for n in normalized_batch if n not in existing]
+        if not to_write:
+            return
+
+        FIELDS_JSONL.parent.mkdir(parents=True, exist_ok=True)
+        with FIELDS_JSONL.open("a", encoding="utf-8", newline="\n") as f:
+            for n in to_write:
+                f.write(dumps_line({n: ""}))
+                _log_s4(f"New field added {n}")
+        # keep the cached set in step with our own append instead of re-parsing next time
+        existing.update(to_write)
+        fp = _file_fingerprint(FIELDS_JSONL)
+        _FIELD_NAMES_CACHE = (fp, existing) if fp else None
+
+_POPUP_FORM_SELECTOR = "form, [role='form'], input:not([type='hidden' i]), textarea, select"
+
+async def _wait_popup_ready(new_page: Page, timeout_ms: int = 15000) -> None:
+    """Return at DOMContentLoaded or as soon as form markup is attached, whichever comes first."""
+    waiters = {
+        asyncio.create_task(new_page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)),
+        asyncio.create_task(new_page.wait_for_selector(_POPUP_FORM_SELECTOR, state="attached", timeout=timeout_ms)),
+    }
+    try:
+        pending = waiters
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(not t.cancelled() and t.exception() is None for t in done):
+                return  # a failed waiter (e.g. closed page) leaves the other one running
+    finally:
+        for t in waiters:
+            t.cancel()
+        # collect outcomes so cancelled/failed waiters do not log "exception never retrieved"
+        await asyncio.gather(*waiters, return_exceptions=True)
 
 async def _scrape_and_store_fields(new_page: Page) -> None:
     """
-    In the popup tab:
-      - wait for load, dismiss overlays
+    In the popup tab (the caller has already waited for DOMContentLoaded or a form):
+      - let the DOM settle, dismiss overlays
       - collect field names and append to fields.jsonl (case-insensitive dedup, store lowercase)
     """
-    with suppress(Exception):
-        await new_page.wait_for_load_state("domcontentloaded", timeout=15000)
-    with suppress(Exception):
-        await new_page.wait_for_load_state("networkidle", timeout=8000)
+    # ATS forms render client-side; wait for the DOM to settle rather than for networkidle
+    await wait_dom_quiet(new_page)
 
     # Dismiss cookies/popups/overlays before scraping fields
     with suppress(Exception):
@@ -656,62 +879,79 @@ async def _scrape_and_store_fields(new_page: Page) -> None:
 
     names = await _collect_field_names_js(new_page)
     if names:
-        _append_fields_jsonl_dedup_lower(names)
+        await asyncio.to_thread(_append_fields_jsonl_dedup_lower, names)
 
 
 # --------------------------- Apply detection flow ----------------------------
 
-async def find_apply_button(page: Page):
-    """Generic Apply button (non 1-click)."""
-    regexes = [re.compile(pat, re.I) for pat in [
-        r"\bapply now?\b", r"\bapply\b", r"\bsubmit application\b", r"\bsend application\b",
-        r"\baplikuj\b", r"\bwyślij\b"
-    ]]
-    for rx in regexes:
-        for by_role in ("button", "link"):
-            loc = page.get_by_role(by_role, name=rx)
-            if await loc.count() > 0:
-                return loc.first
-    candidates = [
-        "[data-testid*='apply' i]", "[data-test*='apply' i]",
-        "button[type='submit']", "button[name*='apply' i]", "[aria-label*='apply' i]",
-        "a[href*='apply' i]", "button:has-text('Apply')", "a:has-text('Apply')",
-        "button:has-text('Aplikuj')", "a:has-text('Aplikuj')",
-        "button:has-text('Submit')", "button:has-text('Send')",
-        "a:has-text('Submit')", "a:has-text('Send')",
-    ]
-    for sel in candidates:
-        loc = page.locator(sel)
-        if await loc.count() > 0:
-            return loc.first
-    return None
-
-async def _extract_probable_href(page: Page, loc) -> Optional[str]:
-    with suppress(Exception):
-        href = await loc.get_attribute("href")
-        if href:
-            return urljoin(page.url, href)
-    with suppress(Exception):
-        href = await loc.get_attribute("data-href")
-        if href:
-            return urljoin(page.url, href)
-    with suppress(Exception):
-        href = await loc.get_attribute("data-url")
-        if href:
-            return urljoin(page.url, href)
-    with suppress(Exception):
-        handle = await loc.element_handle()
-        if handle:
-            href = await page.evaluate(
-                """(el) => {
-                    const a = el.closest && el.closest('a');
-                    return a ? a.href : null;
-                }""",
-                handle
-            )
-            if href:
-                return href
-    return None
+# Apply CTA lookup, in priority order: accessible-name patterns (buttons before links),
+# plain CSS hooks, then loose text (Playwright :has-text equivalents).
+_APPLY_NAME_PATTERNS = [
+    r"\bapply now?\b", r"\bapply\b", r"\bsubmit application\b", r"\bsend application\b",
+    r"\baplikuj\b", r"\bwyślij\b",
+]
+_APPLY_CSS = [
+    "[data-testid*='apply' i]", "[data-test*='apply' i]",
+    "button[type='submit']", "button[name*='apply' i]", "[aria-label*='apply' i]",
+    "a[href*='apply' i]",
+]
+_APPLY_LOOSE_TEXTS = ["apply", "aplikuj", "submit", "send"]
+
+# Single in-page scan; marks the winner with data-s3-apply so Python can resolve one locator.
+_FIND_APPLY_JS = """
+({names, css, loose}) => {
+  for (const el of document.querySelectorAll('[data-s3-apply]')) el.removeAttribute('data-s3-apply');
+  // href / data-href / data-url on the element, else the enclosing <a>
+  const probableHref = (el) => {
+    for (const attr of ['href', 'data-href', 'data-url']) {
+      const v = el.getAttribute(attr);
+      if (v) return v;
+    }
+    const a = el.closest && el.closest('a');
+    return a ? a.href : null;
+  };
+  const mark = (el) => { el.setAttribute('data-s3-apply', '1'); return {href: probableHref(el)}; };
+  const visible = (el) => el.getClientRects().length > 0;
+  const label = (el) => (el.getAttribute('aria-label') || el.innerText || el.value || '').trim();
+  const buttons = Array.from(document.querySelectorAll(
+    "button, [role='button'], input[type='submit'], input[type='button']")).filter(visible);
+  const links = Array.from(document.querySelectorAll("a[href], [role='link']")).filter(visible);
+  for (const src of names) {
+    const re = new RegExp(src, 'i');
+    for (const group of [buttons, links]) {
+      const hit = group.find(el => re.test(label(el)));
+      if (hit) return mark(hit);
+    }
+  }
+  for (const sel of css) {
+    const el = document.querySelector(sel);
+    if (el) return mark(el);
+  }
+  const plain = Array.from(document.querySelectorAll('button, a'));
+  for (const t of loose) {
+    const hit = plain.find(el => (el.innerText || el.textContent || '').toLowerCase().includes(t));
+    if (hit) return mark(hit);
+  }
+  return null;
+}
+"""
+
+async def find_apply_button(page: Page) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Generic Apply button (non 1-click), found with one in-page scan that also reads its
+    probable target href (absolute). Returns (locator, href), or (None, None) when nothing matched.
+    """
+    try:
+        found = await page.evaluate(_FIND_APPLY_JS, {
+            "names": _APPLY_NAME_PATTERNS, "css": _APPLY_CSS, "loose": _APPLY_LOOSE_TEXTS,
+        })
+    except Exception:
+        return None, None
+    if not found:
+        return None, None
+    href = found.get("href")
+    # attribute values may be relative: resolve against the job page like the browser would
+    return page.locator("[data-s3-apply]").first, (urljoin(page.url, href) if href else None)
 
 async def click_apply_and_detect(ctx: BrowserContext, page: Page) -> Dict[str, Any]:
     """
@@ -722,16 +962,16 @@ async def click_apply_and_detect(ctx: BrowserContext, page: Page) -> Dict[str, A
          - If no new tab -> mode='no_new_tab'.
       3) If no Apply at all, apply_found=False.
     """
+    # Both probes are independent in-page scans: run them concurrently so the common
+    # "no 1-click" case does not pay for two sequential round-trips
+    one_click, (apply, pre_href) = await asyncio.gather(find_one_click_apply(page), find_apply_button(page))
+
     # 1) Try one-click
-    one_click = await find_one_click_apply(page)
     if one_click:
         _log("Found 1-click Apply -> clicking")
-        with suppress(Exception):
-            await one_click.scroll_into_view_if_needed()
-            await one_click.hover()
         clicked = False
         with suppress(Exception):
-            await one_click.click(no_wait_after=True); clicked = True
+            await one_click.click(no_wait_after=True, timeout=5000); clicked = True
         if not clicked:
             with suppress(Exception):
                 await one_click.evaluate("el => el.click()"); clicked = True
@@ -748,7 +988,6 @@ async def click_apply_and_detect(ctx: BrowserContext, page: Page) -> Dict[str, A
         }
 
     # 2) Fallback: normal apply => expect a new tab only
-    apply = await find_apply_button(page)
     if not apply:
         _log(f"[{page.url}] Apply button NOT found")
         return {
@@ -762,51 +1001,61 @@ async def click_apply_and_detect(ctx: BrowserContext, page: Page) -> Dict[str, A
         }
 
     _log("Pressing Apply (expecting a new tab only)")
-    pages_before = list(ctx.pages)
-    pre_href = await _extract_probable_href(page, apply)
 
-    with suppress(Exception):
-        await apply.scroll_into_view_if_needed()
-        await apply.hover()
+    # Arm the popup waiter before clicking so the event cannot be missed. Only tabs opened
+    # by this page count: other workers share the context and open their own tabs.
+    popups: List[Page] = []
+    popup_seen = asyncio.Event()
+
+    def on_popup(p: Page) -> None:
+        popups.append(p)
+        popup_seen.set()
+
+    page.on("popup", on_popup)
+    waiters = {asyncio.create_task(popup_seen.wait())}
+    # read before clicking: a fast same-tab route change could otherwise already be in page.url
+    start_url = (page.url or "").split("#")[0]
 
     clicked = False
     with suppress(Exception):
-        await apply.click(no_wait_after=True); clicked = True
+        # click() scrolls into view and hovers itself; a blocked target falls back to el.click()
+        await apply.click(no_wait_after=True, timeout=5000); clicked = True
     if not clicked:
         with suppress(Exception):
             await apply.evaluate("el => el.click()"); clicked = True
 
-    # Wait for a new tab/popup
+    # A click that navigated this very tab means no popup is coming: stop waiting shortly after
+    async def _left_job_page() -> None:
+        await page.wait_for_url(lambda u: u.split("#")[0] != start_url, wait_until="commit", timeout=12000)
+        await asyncio.sleep(1.5)  # grace for a popup opened right before the navigation
+
+    if clicked:
+        waiters.add(asyncio.create_task(_left_job_page()))
+
+    # Wait for a new tab/popup (first signal wins, ~12s cap; nothing to wait for if the click failed)
     try:
-        for _ in range(60):  # ~12s total (60 * 200ms)
-            new_pages = [p for p in ctx.pages if p not in pages_before]
-            if new_pages:
-                new_page = new_pages[0]
-                with suppress(Exception):
-                    await new_page.wait_for_load_state("domcontentloaded", timeout=15000)
-                with suppress(Exception):
-                    await new_page.wait_for_load_state("networkidle", timeout=8000)
-                final_url = new_page.url or (pre_href or "") or (page.url or "")
+        await asyncio.wait(waiters, timeout=12 if clicked else 0, return_when=asyncio.FIRST_COMPLETED)
+        new_page: Optional[Page] = popups[0] if popups else None
+        if new_page is not None:
+            await _wait_popup_ready(new_page)
+            final_url = new_page.url or (pre_href or "") or (page.url or "")
 
-                # S4: dismiss overlays, scrape & store field names, then close the popup
-                try:
-                    with suppress(Exception):
-                        await dismiss_popups_and_cookies(new_page)
-                    await _scrape_and_store_fields(new_page)  # includes a second, internal dismissal & waits
-                finally:
-                    with suppress(Exception):
-                        await new_page.close()
-
-                return {
-                    "apply_found": True,
-                    "one_click": False,
-                    "app_completed": False,
-                    "clicked": clicked,
-                    "easy_apply": False,
-                    "final_url": final_url,
-                    "mode": "popup"
-                }
-            await asyncio.sleep(0.2)
+            # S4: dismiss overlays, scrape & store field names, then close the popup
+            try:
+                await _scrape_and_store_fields(new_page)  # does the idle wait + overlay dismissal once
+            finally:
+                with suppress(Exception):
+                    await new_page.close()
+
+            return {
+                "apply_found": True,
+                "one_click": False,
+                "app_completed": False,
+                "clicked": clicked,
+                "easy_apply": False,
+                "final_url": final_url,
+                "mode": "popup"
+            }
 
         # No popup/new tab in time
         final_url = pre_href or (page.url or "")
@@ -831,35 +1080,37 @@ async def click_apply_and_detect(ctx: BrowserContext, page: Page) -> Dict[str, A
             "mode": "error"
         }
     finally:
+        for t in waiters:
+            t.cancel()
+        page.remove_listener("popup", on_popup)
         # Close unexpected extras (if any)
-        extras = [p for p in ctx.pages if p not in pages_before and p is not page]
-        for p in extras:
+        for p in popups:
             with suppress(Exception):
                 await p.close()
 
 
 # ------------------ Description cleaning to visible rows ---------------------
 
-import re as _re
+_INVISIBLES_RX = re.compile(r"[\u200B-\u200D\uFEFF]")
 
 def _strip_invisibles(text: str) -> str:
     if not text:
         return ""
-    return _re.sub(r"[\u200B-\u200D\uFEFF]", "", text)
+    return _INVISIBLES_RX.sub("", text)
 
 def _slice_between_markers(lines: List[str]) -> List[str]:
     """
     Keep from the FIRST 'All offers' (inclusive) up to BEFORE the NEXT 'Apply' (exclusive).
     If 'All offers' missing -> return original. If 'Apply' missing -> keep to end.
     """
-    norm = [ln.strip() for ln in lines]
+    norm = [ln.strip().lower() for ln in lines]
     try:
-        start = next(i for i, ln in enumerate(norm) if ln.lower() == "all offers")
+        start = next(i for i, ln in enumerate(norm) if ln == "all offers")
     except StopIteration:
         return lines
     end = None
     for j in range(start + 1, len(norm)):
-        if norm[j].lower() == "apply":
+        if norm[j] == "apply":
             end = j
             break
     return lines[start:end] if end is not None else lines[start:]
@@ -874,36 +1125,106 @@ def to_visible_rows(text: str) -> List[str]:
     return lines
 
 
+# --------------------------- Request filtering -------------------------------
+
+# Resource types never needed to read the description text.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+_TRACKER_HOSTS = (
+    "doubleclick.net", "google-analytics.com", "googletagmanager.com",
+    "googlesyndication.com", "hotjar.com", "facebook.net",
+    "clarity.ms", "segment.io", "mixpanel.com", "hs-analytics.net", "ads.linkedin.com",
+)
+
+_TRACKER_HOST_RX = re.compile(
+    r"(?:^|\.)(?:" + "|".join(re.escape(h) for h in _TRACKER_HOSTS) + r")$",
+    re.I
+)
+
+# Trackers fail DNS inside Chromium itself: no request interception, so the HTTP cache stays on
+# (any ctx.route handler disables it).
+_TRACKER_RESOLVER_ARG = "--host-resolver-rules=" + ", ".join(
+    f"MAP {pat} ~NOTFOUND" for h in _TRACKER_HOSTS for pat in (h, f"*.{h}")
+)
+
+def _make_filter_route(blocked_types: frozenset = _BLOCKED_RESOURCE_TYPES):
+    """Route handler aborting blocked_types and known trackers; everything else goes through."""
+    async def _filter_route(route) -> None:
+        req = route.request
+        if req.resource_type in blocked_types or _TRACKER_HOST_RX.search(_host(req.url)):
+            with suppress(Exception):
+                await route.abort()
+            return
+        with suppress(Exception):
+            await route.continue_()
+    return _filter_route
+
+
 # ----------------------------- Link management -------------------------------
 
+# links.jsonl parsed once per run; consumed flags are flipped in this list and
+# written back in batches by _flush_consumed
+_LINKS_CACHE: Optional[List[Dict[str, Any]]] = None
+_LINKS_INDEX: Dict[str, Dict[str, Any]] = {}  # url (or id) -> first row with that key
+_CONSUMED_PENDING: set = set()
+CONSUMED_FLUSH_EVERY = 50
+
 def _write_jsonl(path: Path, rows: List[Dict[str, Any]]) -> None:
+    """Rewrite `path` in one write via a temp file in the same dir, then atomic replace."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    payload = "".join(dumps_line(r) for r in rows if isinstance(r, dict))
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="\n", delete=False,
+                                     dir=str(path.parent)) as tmp:
+        tmp_path = Path(tmp.name)
+        tmp.write(payload)
+    shutil.move(str(tmp_path), str(path))
+
+def _links_rows() -> List[Dict[str, Any]]:
+    global _LINKS_CACHE
+    if _LINKS_CACHE is None:
+        _LINKS_CACHE = list(read_jsonl(LINKS_JSONL))  # one-line JSONL reader assumed
+        _LINKS_INDEX.clear()
+        for r in _LINKS_CACHE:
+            k = r.get("url") or r.get("id")
+            if k:
+                _LINKS_INDEX.setdefault(k, r)
+    return _LINKS_CACHE
+
+def _invalidate_links_cache() -> None:
+    global _LINKS_CACHE
+    _LINKS_CACHE = None
+    _LINKS_INDEX.clear()
+    _CONSUMED_PENDING.clear()
+
+def iter_new_links(limit: int = 0) -> Iterator[Dict[str, Any]]:
+    """Lazily yield up to `limit` rows with new_href=true (all when limit <= 0)."""
+    rows = (r for r in _links_rows() if r.get("new_href") is True)
+    return islice(rows, limit) if limit > 0 else rows
 
 def take_new_links(limit: int) -> List[Dict[str, Any]]:
-    all_rows = list(read_jsonl(LINKS_JSONL))  # one-line JSONL reader assumed
-    new_rows = [r for r in all_rows if r.get("new_href") is True]
-    if limit and limit > 0:
-        return new_rows[:limit]
-    return new_rows
+    """First `limit` rows with new_href=true (all when limit <= 0); stops scanning once full."""
+    return list(iter_new_links(limit))
 
 def mark_link_consumed(row: Dict[str, Any]) -> None:
+    """Flag the row consumed in memory; the file is rewritten every CONSUMED_FLUSH_EVERY rows."""
     key = row.get("url") or row.get("id")
     if not key:
         return
-    all_rows = list(read_jsonl(LINKS_JSONL))
-    changed = False
-    for r in all_rows:
-        k = r.get("url") or r.get("id")
-        if k == key:
-            if r.get("new_href") is not False:
-                r["new_href"] = False
-                changed = True
-            break
-    if changed:
-        _write_jsonl(Path(LINKS_JSONL), all_rows)
+    _links_rows()
+    r = _LINKS_INDEX.get(key)
+    if r is not None and r.get("new_href") is not False:
+        r["new_href"] = False
+        _CONSUMED_PENDING.add(key)
+    if len(_CONSUMED_PENDING) >= CONSUMED_FLUSH_EVERY:
+        _flush_consumed()
+
+def _flush_consumed() -> None:
+    """Write all pending new_href=false flags to links.jsonl in one rewrite."""
+    if not _CONSUMED_PENDING or _LINKS_CACHE is None:
+        return
+    _flush_filtered()  # results first, so a consumed link never lacks its filtered row
+    _write_jsonl(Path(LINKS_JSONL), _LINKS_CACHE)
+    _CONSUMED_PENDING.clear()
 
 
 # ------------------------------ Config loading -------------------------------
@@ -924,25 +1245,84 @@ def _load_config() -> Dict[str, Any]:
 
 # --------------------------------- S3 core -----------------------------------
 
-async def process_one(ctx: BrowserContext, row: Dict[str, Any], keywords: List[str], headful: bool, fail_fast: bool) -> bool:
-    page: Optional[Page] = None
+class HostRateLimiter:
+    """Space out navigations to the same host by a random gap; other hosts are never delayed."""
+
+    def __init__(self, min_s: float, max_s: float):
+        self.min_s, self.max_s = min_s, max_s
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._next_at: Dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        host = _host(url)
+        async with self._locks[host]:
+            delay = self._next_at.get(host, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_at[host] = time.monotonic() + random.uniform(self.min_s, self.max_s)
+
+# Throttling answers: back off exponentially (or per Retry-After) and retry the navigation
+_THROTTLE_STATUSES = frozenset({429, 503})
+THROTTLE_RETRIES = 3
+
+# CDP sessions of tabs that had scripts switched off at least once
+_CDP_SESSIONS: Dict[Page, Any] = {}
+
+async def _goto_job_page(page: Page, url: str, scripts: bool = True) -> None:
+    cdp = _CDP_SESSIONS.get(page)
+    if cdp is None and not scripts:
+        # Per-tab switch (Chromium CDP): the persistent context cannot spawn a JS-less sibling
+        cdp = _CDP_SESSIONS[page] = await page.context.new_cdp_session(page)
+    if cdp is not None:
+        await cdp.send("Emulation.setScriptExecutionDisabled", {"value": not scripts})
+    for attempt in range(THROTTLE_RETRIES + 1):
+        resp = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        status = resp.status if resp is not None else 0
+        if status not in _THROTTLE_STATUSES:
+            return
+        if attempt == THROTTLE_RETRIES:
+            # leave the row unconsumed; it is retried in a later batch
+            raise RuntimeError(f"HTTP {status} (throttled) after {THROTTLE_RETRIES} retries: {url}")
+        delay = min(60.0, 2.0 ** (attempt + 2))
+        with suppress(Exception):
+            delay = min(60.0, float(resp.headers.get("retry-after")))
+        _log(f"HTTP {status} -> backing off {delay:.0f}s before retry")
+        await asyncio.sleep(delay)
+
+async def process_one(page: Page, row: Dict[str, Any], matcher: KeywordMatcher, headful: bool, fail_fast: bool,
+                      no_js_static: bool = False, shot_mode: str = "viewport") -> bool:
+    """
+    Process one link in a long-lived tab (the caller reuses `page` across rows;
+    after an error it is reset to about:blank, or closed if that fails so the
+    caller opens a fresh one).
+    no_js_static: read server-rendered pages (non-SPA hosts) with scripts disabled.
+    The row is reloaded with scripts when that yields no text, and the Apply
+    flow always runs with scripts enabled.
+    shot_mode: error screenshot, "viewport", "full" (slow on long pages) or "none".
+    """
+    ctx = page.context
     url = row.get("url")
     if not url:
         return False
+    use_static = no_js_static and not _needs_lazy_load(url)
     try:
         _log(f'Processing new link: "{url}"')
-        page = await ctx.new_page()
-        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        with suppress(Exception):
-            await page.wait_for_load_state("networkidle", timeout=8000)
+        await _goto_job_page(page, url, scripts=not use_static)
 
-        # Scroll before detection
-        await slow_scroll_page_to_bottom(page)
+        # Static (server-rendered) pages are complete at DOM-ready; only SPA hosts need idle + scroll
+        if _needs_lazy_load(url):
+            await wait_dom_quiet(page)
+            await slow_scroll_page_to_bottom(page)
 
         # Extract description + keywords
-        desc_full = await get_job_description_text(page)
+        desc_full, matched = await read_description(page, matcher)
+        if use_static and not desc_full:
+            _log("No server-rendered description -> retrying with JavaScript")
+            await _goto_job_page(page, url)
+            use_static = False
+            desc_full, matched = await read_description(page, matcher)
         desc_rows = to_visible_rows(desc_full)
-        keyword_exists, matched = find_keywords(desc_full, keywords)
+        keyword_exists = bool(matched)
 
         # Prepare result (final_url initially equals url)
         result = {
@@ -961,13 +1341,13 @@ async def process_one(ctx: BrowserContext, row: Dict[str, Any], keywords: List[s
         # No keywords -> processed=true
         if not keyword_exists:
             result["processed"] = True
-            _upsert_filtered_record_oneline(result, match_by_final_url=True)
+            await _store_filtered(result, match_by_final_url=True)
             _log("Processed (no keywords matched)")
-            with suppress(Exception):
-                await page.close()
             return True
 
-        # Detect apply path
+        # Detect apply path (needs scripts: reload static pages with JS on)
+        if use_static:
+            await _goto_job_page(page, url)
         info = await click_apply_and_detect(ctx, page)
         result["easy_apply"] = bool(info["easy_apply"])
         result["final_url"] = info["final_url"]
@@ -976,33 +1356,20 @@ async def process_one(ctx: BrowserContext, row: Dict[str, Any], keywords: List[s
         if not info["apply_found"]:
             result["outdated"] = True
             result["processed"] = True
-            _upsert_filtered_record_oneline(result, match_by_final_url=False)
+            await _store_filtered(result)
             _log("Processed (apply not found) -> outdated=true")
-            with suppress(Exception):
-                await page.close()
             return True
 
         # 1-click completed
         if info.get("one_click") and info.get("app_completed"):
             result["processed"] = True
-            _upsert_filtered_record_oneline(result, match_by_final_url=False)
+            await _store_filtered(result)
             _log("Processed (1-click completed)")
-            with suppress(Exception):
-                await page.close()
             return True
 
         # Normal Apply branch
-        _upsert_filtered_record_oneline(result, match_by_final_url=False)
+        await _store_filtered(result)
         _log(f"Processed (mode={info.get('mode')})")
-
-        # Cleanup extra pages
-        for p in list(ctx.pages):
-            if p is page:
-                continue
-            with suppress(Exception):
-                await p.close()
-        with suppress(Exception):
-            await page.close()
         return True
 
     except Exception:
@@ -1011,68 +1378,214 @@ async def process_one(ctx: BrowserContext, row: Dict[str, Any], keywords: List[s
         SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
         png = SCREENSHOTS_DIR / f"s3_{safe_filename(row.get('id') or 'item')}_{ts}.png"
         txt = ERRORS_DIR / f"s3_{safe_filename(row.get('id') or 'item')}_{ts}.txt"
-        with suppress(Exception):
-            if page:
-                await page.screenshot(path=str(png), full_page=True)
-        with txt.open("w", encoding="utf-8") as f:
-            f.write(f"TIME: {now_iso()}\nURL: {url}\n\nTRACEBACK:\n{traceback.format_exc()}\n")
-        print(f"[ERROR] s3_filter: saved {png.name} and {txt.name}")
+        # disk writes go through a thread so other in-flight pages are not stalled
+        await asyncio.to_thread(
+            txt.write_text,
+            f"TIME: {now_iso()}\nURL: {url}\n\nTRACEBACK:\n{traceback.format_exc()}\n",
+            "utf-8",
+        )
+        shot = False
+        if shot_mode != "none":
+            with suppress(Exception):
+                data = await page.screenshot(full_page=(shot_mode == "full"))
+                await asyncio.to_thread(png.write_bytes, data)
+                shot = True
+        print(f"[ERROR] s3_filter: saved {png.name + ' and ' if shot else ''}{txt.name}")
+        # reset the tab for the next row; only a tab that cannot navigate is discarded
+        try:
+            await page.goto("about:blank", timeout=5000)
+        except Exception:
+            _CDP_SESSIONS.pop(page, None)
+            with suppress(Exception):
+                await page.close()
         if fail_fast:
             raise
         return False
-    finally:
-        if page and not page.is_closed():
-            with suppress(Exception):
-                await page.close()
 
 
-async def run_with_config():
+# Chromium flags: stealth/popups as before, plus no background services competing with the tabs.
+# Sandbox and site isolation are deliberately left on.
+_CHROMIUM_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-popup-blocking",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-features=Translate",
+    "--no-first-run",
+    "--mute-audio",
+]
+
+# S1's storage_state localStorage, applied per origin; keys the site has already set are kept.
+_SEED_LOCAL_STORAGE_JS = """
+(origins) => {
+  for (const o of origins) {
+    if (o.origin !== location.origin) continue;
+    for (const {name, value} of (o.localStorage || [])) {
+      try { if (localStorage.getItem(name) === null) localStorage.setItem(name, value); } catch (e) {}
+    }
+  }
+}
+"""
+
+WORKER_STAGGER_S = 0.1  # start delay step between batch workers
+PAGE_RECYCLE_ROWS = 50  # rows one pooled tab serves before it is closed and replaced
+
+
+async def run_with_config(concurrency: Optional[int] = None):
+    """concurrency overrides config CONCURRENCY (number of tabs processing rows in parallel)."""
     cfg = _load_config()
+    _invalidate_links_cache()  # pick up links S2 appended since any earlier run in this process
     headful = bool(cfg.get("HEADFUL", True))
     fail_fast = bool(cfg.get("FAIL_FAST", False))
     limit = int(cfg.get("LIMIT", 0))
+    block_resources = bool(cfg.get("BLOCK_RESOURCES", True))
+    # off by default: without CSS hidden blocks become visible and end up in the JD text
+    block_stylesheets = bool(cfg.get("BLOCK_STYLESHEETS", False))
+    # off by default: fonts/media can only be blocked by a route handler, which disables the HTTP cache
+    block_fonts_media = bool(cfg.get("BLOCK_FONTS_MEDIA", False))
+    no_js_static = bool(cfg.get("NO_JS_STATIC_PAGES", True))
+    concurrency = max(1, int(concurrency or cfg.get("CONCURRENCY", 4)))
+    default_timeout_ms = int(cfg.get("DEFAULT_TIMEOUT_MS", 5000))
+    # Error screenshots: "viewport" (default), "full" (full page, slow on long pages) or "none"
+    shot_mode = str(cfg.get("ERROR_SHOT", "viewport")).strip().lower()
     keywords = normalize_keywords(cfg.get("KEYWORDS"))
+    matcher = build_keyword_matcher(keywords)
     storage_state = str(STORAGE_STATE_JSON) if Path(STORAGE_STATE_JSON).exists() else None
 
+    # Pause between same-host rows only on request; throttling is handled by backoff in _goto_job_page
+    polite_delay = bool(cfg.get("POLITE_DELAY", False))
     short_min = int(cfg.get("SHORT_TIMEOUT_MIN", 60))
     short_max = int(cfg.get("SHORT_TIMEOUT_MAX", 180))
     long_min = int(cfg.get("LONG_TIMEOUT_MIN", 300))
     long_max = int(cfg.get("LONG_TIMEOUT_MAX", 660))
 
+    from playwright.async_api import async_playwright
+
     async with async_playwright() as p:
-        browser: Browser = await p.chromium.launch(
+        # Persistent profile keeps the HTTP cache/service workers between runs
+        ctx: BrowserContext = await p.chromium.launch_persistent_context(
+            user_data_dir=str(PROFILE_DIR),
             headless=not headful,
             args=[
-                "--disable-blink-features=AutomationControlled",
-                "--disable-popup-blocking",
+                *_CHROMIUM_ARGS,
+                # images and trackers are never requested at all, without intercepting requests
+                *(["--blink-settings=imagesEnabled=false", _TRACKER_RESOLVER_ARG] if block_resources else []),
+                # nothing is looked at in headless runs: skip GPU process/raster buffers
+                *([] if headful else ["--disable-gpu"]),
             ],
         )
-        ctx_kwargs = {}
         if storage_state:
-            ctx_kwargs["storage_state"] = storage_state
-        ctx: BrowserContext = await browser.new_context(**ctx_kwargs)
-        ctx.set_default_timeout(15000)
+            # persistent contexts take no storage_state: seed the S1 login cookies and localStorage
+            with suppress(Exception):
+                state = json.loads(Path(storage_state).read_text(encoding="utf-8"))
+                await ctx.add_cookies(state.get("cookies") or [])
+                if state.get("origins"):
+                    await ctx.add_init_script(f"({_SEED_LOCAL_STORAGE_JS})({json.dumps(state['origins'])})")
+        # every slow operation (goto, popup/completion waits, clicks) passes its own timeout,
+        # so the default only bounds speculative locator probes
+        ctx.set_default_timeout(default_timeout_ms)
+        await ctx.add_init_script(DOM_QUIET_INIT_JS)
+        if block_resources and (block_fonts_media or block_stylesheets):
+            # opt-in only: routing every request turns the HTTP cache off
+            blocked = ((_BLOCKED_RESOURCE_TYPES if block_fonts_media else frozenset())
+                       | ({"stylesheet"} if block_stylesheets else frozenset()))
+            await ctx.route("**/*", _make_filter_route(blocked))
+
+        # Pool of long-lived tabs navigated row by row (persistent contexts start with one);
+        # more are opened on demand, never beyond `concurrency`
+        page_pool: "asyncio.Queue[Page]" = asyncio.Queue()
+        for pg in ctx.pages[:1]:
+            page_pool.put_nowait(pg)
+        tabs: List[Page] = list(ctx.pages[:1])
+        consume_lock = asyncio.Lock()
+        page_uses: Dict[Page, int] = {}
+
+        opening = 0  # tabs being created: they hold a slot before new_page() returns
+
+        async def open_tab() -> Page:
+            nonlocal opening
+            opening += 1
+            try:
+                pg = await ctx.new_page()
+            finally:
+                opening -= 1
+            tabs.append(pg)
+            return pg
+
+        async def acquire_page() -> Page:
+            if page_pool.empty() and len(tabs) + opening < concurrency:
+                return await open_tab()
+            pg = await page_pool.get()
+            if pg.is_closed():
+                page_uses.pop(pg, None)
+                _CDP_SESSIONS.pop(pg, None)
+                tabs.remove(pg)
+                return await open_tab()
+            return pg
+
+        async def release_page(pg: Page) -> None:
+            # a tab that served PAGE_RECYCLE_ROWS rows is closed (bounding renderer memory);
+            # acquire_page opens a fresh one in its place
+            page_uses[pg] = page_uses.get(pg, 0) + 1
+            if page_uses[pg] < PAGE_RECYCLE_ROWS:
+                page_pool.put_nowait(pg)
+                return
+            page_uses.pop(pg, None)
+            _CDP_SESSIONS.pop(pg, None)
+            tabs.remove(pg)
+            with suppress(Exception):
+                await pg.close()
+
+        limiter = HostRateLimiter(short_min, short_max) if polite_delay else None
+
+        async def produce(queue: "asyncio.Queue[Optional[Dict[str, Any]]]", n_workers: int) -> None:
+            # rows are streamed into a bounded queue; one None per worker marks the end
+            for row in iter_new_links(limit):
+                await queue.put(row)
+            for _ in range(n_workers):
+                await queue.put(None)
+
+        async def worker(queue: "asyncio.Queue[Optional[Dict[str, Any]]]", idx: int) -> None:
+            # staggered start so the first N navigations do not hit the site in the same instant
+            await asyncio.sleep(idx * WORKER_STAGGER_S)
+            while True:
+                row = await queue.get()
+                if row is None:
+                    return
+                if limiter is not None:
+                    await limiter.wait(row.get("url") or "")
+                page = await acquire_page()
+                ok = False
+                try:
+                    ok = await process_one(page, row, matcher, headful, fail_fast, no_js_static, shot_mode)
+                except Exception:
+                    ok = False
+                finally:
+                    await release_page(page)
+                if ok:
+                    async with consume_lock:
+                        await asyncio.to_thread(mark_link_consumed, row)
 
         batch_num = 0
         while True:
-            rows = take_new_links(limit)
-            if not rows:
+            count = sum(1 for _ in iter_new_links(limit))
+            if not count:
                 if batch_num == 0:
                     print("[INFO] No new links with new_href=true found.")
                 break
 
             batch_num += 1
-            print(f"[S3] === BATCH #{batch_num}: processing {len(rows)} item(s) ===")
+            print(f"[S3] === BATCH #{batch_num}: processing {count} item(s) ===")
 
-            for idx, row in enumerate(rows, start=1):
-                ok = False
-                try:
-                    ok = await process_one(ctx, row, keywords, headful, fail_fast)
-                except Exception:
-                    ok = False
-                if ok:
-                    mark_link_consumed(row)
-                await asyncio.sleep(random.uniform(short_min, short_max))
+            n_workers = min(concurrency, count)
+            queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=n_workers * 4)
+            try:
+                await asyncio.gather(produce(queue, n_workers), *(worker(queue, i) for i in range(n_workers)))
+            finally:
+                await asyncio.to_thread(_flush_filtered)
+                await asyncio.to_thread(_flush_consumed)
 
             has_more = bool(take_new_links(1))
             if has_more:
@@ -1090,11 +1603,14 @@ async def run_with_config():
                 print("[S3] All new_href:true links are processed.")
 
         await ctx.close()
-        await browser.close()
 
 
 def main():
-    asyncio.run(run_with_config())
+    parser = argparse.ArgumentParser(description="S3: filter job descriptions and detect Apply flow")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Rows processed in parallel (default: config CONCURRENCY)")
+    args = parser.parse_args()
+    asyncio.run(run_with_config(concurrency=args.concurrency))
 
 
 if __name__ == "__main__":
@@ -16,67 +16,59 @@ from pathlib import Path
 import json, sys, re
 from typing import Dict, Any, Iterable, List, Optional
 
+from .common import loads_line
+
 IN = Path("data/filtered_links.jsonl")
 OUT = Path("data/manual_work.jsonl")
 
+_WS_RX = re.compile(r"\s*")
+_INVISIBLES_RX = re.compile(r"[\u200B-\u200D\uFEFF]")
+
 
 def iter_json_objects(p: Path) -> Iterable[Dict[str, Any]]:
     """
     Robustly stream JSON objects from a file where objects may be:
     - one per line (classic .jsonl), or
     - pretty-printed across multiple lines, back-to-back.
+    Lines are parsed one by one (orjson when installed); from the first line that is not
+    a whole object on its own, the rest of the file is decoded object by object instead.
     """
-    dec = json.JSONDecoder()
-    buf: List[str] = []
-    depth = 0
-    in_str = False
-    esc = False
-
-    with p.open("r", encoding="utf-8") as f:
-        for line in f:
-            for ch in line:
-                buf.append(ch)
-                if in_str:
-                    if esc:
-                        esc = False
-                    elif ch == "\\":
-                        esc = True
-                    elif ch == '"':
-                        in_str = False
-                else:
-                    if ch == '"':
-                        in_str = True
-                    elif ch == "{":
-                        depth += 1
-                    elif ch == "}":
-                        depth -= 1
-
-                if depth == 0 and buf and any(c.strip() for c in buf):
-                    s = "".join(buf).strip()
-                    if not s:
-                        buf = []
-                        continue
-                    try:
-                        obj, idx = dec.raw_decode(s)
-                    except Exception:
-                        # keep accumulating if not decodable yet
-                        continue
-                    yield obj
-                    rest = s[idx:].lstrip()
-                    buf = list(rest) if rest else []
-
-        # trailing remainder
-        if any(c.strip() for c in buf):
-            s = "".join(buf).strip()
-            obj, _ = dec.raw_decode(s)
+    data = p.read_bytes()
+    pos = 0
+    for line in data.split(b"\n"):
+        s = line.strip()
+        if s:
+            try:
+                obj = loads_line(s)
+            except ValueError:
+                break
+            if not isinstance(obj, dict):
+                break
             yield obj
+        pos += len(line) + 1
+    else:
+        return
+
+    # slow path: objects spanning several lines (or several per line)
+    text = data[pos:].decode("utf-8")
+    dec = json.JSONDecoder()
+    idx = _WS_RX.match(text, 0).end()
+    while idx < len(text):
+        try:
+            obj, idx = dec.raw_decode(text, idx)
+        except json.JSONDecodeError as e:
+            # e.g. a row cut short by an interrupted write: keep everything before it
+            print(f"[S5] Stopped at undecodable data in {p} ({e})", file=sys.stderr)
+            return
+        yield obj
+        idx = _WS_RX.match(text, idx).end()
 
 
 def _strip_invisibles(text: str) -> str:
     if not text:
         return ""
     # remove zero-width/invisible characters
-    return re.sub(r"[\u200B-\u200D\uFEFF]", "", text)
+    return _INVISIBLES_RX.sub("", text)
 
 
 def _slice_between_markers(lines: List[str]) -> List[str]: